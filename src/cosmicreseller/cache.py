@@ -0,0 +1,69 @@
+# src/cosmicreseller/cache.py
+
+"""
+Small async TTL + LRU cache helper shared by the scrapers and pricing.
+
+Caches are plain `OrderedDict`s mapping key → (expires_at, value), owned by
+the calling module together with a dict of in-flight lookup locks.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+
+async def cached(
+    cache: OrderedDict,
+    locks: dict[Any, asyncio.Lock],
+    key: Any,
+    fetch: Callable[[], Awaitable[Any]],
+    ttl: float,
+    max_size: int,
+    keep: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Return a fresh cached value for `key`, or fetch and store it.
+
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted beyond `max_size`. Concurrent callers for the same key wait on a
+    per-key lock, so only one fetch is in flight and the rest reuse its
+    result; the lock is dropped once the fetch completes.
+
+    Args:
+        cache (OrderedDict): Cache mapping key → (expires_at, value).
+        locks (dict): In-flight lookup locks for this cache.
+        key: Cache key.
+        fetch: Coroutine function producing the value on a miss.
+        ttl (float): Seconds a fetched value stays fresh.
+        max_size (int): Maximum number of entries kept.
+        keep (callable | None): Predicate deciding whether a fetched value
+            is stored (default: always).
+
+    Returns:
+        The cached or freshly fetched value.
+    """
+    entry = cache.get(key)
+    if entry and time.monotonic() < entry[0]:
+        cache.move_to_end(key)
+        return entry[1]
+
+    lock = locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        try:
+            entry = cache.get(key)
+            if entry and time.monotonic() < entry[0]:
+                cache.move_to_end(key)
+                return entry[1]
+
+            value = await fetch()
+            if keep is None or keep(value):
+                cache[key] = (time.monotonic() + ttl, value)
+                cache.move_to_end(key)
+                while len(cache) > max_size:
+                    cache.popitem(last=False)
+            return value
+        finally:
+            # Callers already waiting hold a reference; later ones hit the cache
+            if locks.get(key) is lock:
+                del locks[key]
@@ -15,6 +15,9 @@ import asyncio
 from hypercorn.asyncio import serve
 from hypercorn.config import Config
 
+from cosmicreseller.scrapers.ebay import close_clients
+from cosmicreseller.scrapers.facebook import close_browser
+from src.cosmicreseller.telegram_bot import close_client as close_telegram_client
 from src.cosmicreseller.telegram_bot import start_bot
 from src.cosmicreseller.webui import create_app
 from src.cosmicreseller.logger import configure_root_logger
@@ -35,12 +38,56 @@ async def main() -> None:
     """
     Run the Telegram bot and web UI concurrently.
     """
-    await asyncio.gather(
-        start_bot(),
-        run_webui(),
-    )
+    try:
+        await asyncio.gather(
+            start_bot(),
+            run_webui(),
+        )
+    finally:
+        await close_clients()
+        await close_browser()
+        await close_telegram_client()
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create the event loop used by `run()`.
+
+    The loop is a uvloop loop when uvloop is installed (faster scheduling
+    and socket I/O), otherwise asyncio's default. On Python 3.12+ it uses
+    `asyncio.eager_task_factory`, so tasks whose coroutine finishes without
+    suspending (e.g. cached eBay token or taxonomy lookups inside `gather`)
+    complete without an extra loop cycle.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    else:
+        loop = uvloop.new_event_loop()
+
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+    return loop
+
+
+def run() -> None:
+    """
+    Run `main()` to completion on the loop from `_new_event_loop()`.
+
+    `asyncio.Runner` keeps `asyncio.run`'s Ctrl+C handling and task cleanup,
+    so the shutdown in `main()` still runs. Before Python 3.11 (no Runner)
+    this falls back to `asyncio.run` on the default loop.
+    """
+    if not hasattr(asyncio, "Runner"):
+        asyncio.run(main())
+        return
+
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        runner.run(main())
 
 
 if __name__ == "__main__":
     configure_root_logger()
-    asyncio.run(main())
+    run()
@@ -8,63 +8,79 @@ Responsibilities:
 - Compute average item prices.
 - Filter items below a user-defined threshold.
 - Route scraping requests to the correct data source (eBay or Facebook).
+- Stream cheap items batch by batch as scraped pages arrive.
 """
 
+import asyncio
+import math
 import re
-from decimal import Decimal, InvalidOperation
-from statistics import mean
-from typing import Iterable, List, Tuple
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import AsyncIterator, Deque, Iterable, List, Tuple
 
-from cosmicreseller.scrapers.ebay import ebay_scraper
+import numpy as np
+
+from cosmicreseller.cache import cached
+from cosmicreseller.scrapers.ebay import ebay_scraper, ebay_scraper_stream
 from cosmicreseller.scrapers.facebook import scrape_facebook_marketplace_items
 
 # Type aliases
 Item = Tuple[str, str, str]         # (title, price_str, url)
 CleanItem = Tuple[str, float, str]  # (title, price_float, url)
 
+# Recent scrape results: (source, keyword, max_items) -> (expires_at, items)
+FETCH_CACHE_TTL = 60
+FETCH_CACHE_SIZE = 128
+_fetch_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, List[Item]]]" = OrderedDict()
+_fetch_locks: "dict[Tuple[str, str, int], asyncio.Lock]" = {}
+
+# Below this many items the plain Python filter is faster than NumPy
+_NUMPY_MIN_ITEMS = 512
+
+# Whitespace (incl. narrow no-break space) stripped in one pass, so digit
+# groups like "1 234,50" need no special handling in the regex
+_STRIP_TABLE = str.maketrans("", "", " \u00a0\u202f\t\n")
+
+# Digit-group separators, dropped once the decimal mark is located
+_SEP_TABLE = str.maketrans("", "", ",.")
+
 # Regex to capture numeric part of prices like "£1,234.50" or "1 234,50"
-_price_re = re.compile(r"[£€$]?\s*([0-9]+(?:[,\.\s][0-9]{3})*(?:[,\.\s][0-9]{2})?)")
+_price_re = re.compile(r"([0-9]+(?:[,.][0-9]{3})*(?:[,.][0-9]{2})?)")
 
 
+@lru_cache(maxsize=4096)
 def _to_float(price_text: str) -> float:
     """
     Convert a raw price string into a float.
 
+    Results are memoized: listings repeat the same price strings a lot
+    ("£10", "GBP 20.00"), so most calls skip parsing entirely.
+
     Handles:
       - "£1,234.50"   → 1234.50
       - "1 234,50"    → 1234.50
+      - "€1.234,50"   → 1234.50
       - "$2,000"      → 2000.00
       - "2000"        → 2000.00
     """
-    cleaned = price_text.replace("\u202f", " ").strip()
-    match = _price_re.search(cleaned)
+    match = _price_re.search(price_text.translate(_STRIP_TABLE))
     if not match:
         raise ValueError(f"No numeric price found in: {price_text!r}")
 
-    raw = match.group(1).replace(" ", "")
-
-    if raw.count(",") and raw.count("."):
-        # Both present → assume ',' thousands, '.' decimal
-        norm = raw.replace(",", "")
-    elif raw.count(",") and not raw.count("."):
-        # Only comma present → decide by last group length
-        parts = raw.split(",")
-        last = parts[-1]
-        if len(last) == 3:
-            # Likely thousands grouping: 2,000 → 2000
-            norm = raw.replace(",", "")
-        elif len(last) == 2:
-            # Likely decimal: 1,23 → 1.23
-            norm = raw.replace(",", ".")
-        else:
-            # Fallback: remove commas
-            norm = raw.replace(",", "")
+    raw = match.group(1)
+
+    # The regex only admits 3-digit groups plus an optional final 2-digit
+    # group, so the last separator is the decimal mark exactly when two
+    # digits follow it; every other separator is thousands grouping.
+    dec_pos = max(raw.rfind("."), raw.rfind(","))
+    if dec_pos != -1 and len(raw) - dec_pos == 3:
+        norm = raw[:dec_pos].translate(_SEP_TABLE) + "." + raw[dec_pos + 1:]
     else:
-        norm = raw
+        norm = raw.translate(_SEP_TABLE)
 
     try:
-        return float(Decimal(norm))
-    except (InvalidOperation, ValueError) as err:
+        return float(norm)
+    except ValueError as err:
         raise ValueError(f"Invalid price string: {price_text!r}") from err
 
 
@@ -85,26 +101,62 @@ def filter_cheap_items(
             - average_price (float): Average price of valid items.
             - cheap_items (list[CleanItem]): List of items below threshold.
     """
-    prices: List[float] = []
+    items = list(items)
+    if len(items) > _NUMPY_MIN_ITEMS:
+        return _filter_cheap_items_numpy(items, threshold_ratio)
+
+    total = 0.0
     clean_items: List[CleanItem] = []
 
     for title, price_text, link in items:
         try:
             price_value = _to_float(price_text)
-            prices.append(price_value)
-            clean_items.append((title, price_value, link))
         except ValueError:
             continue  # skip unparseable prices
+        clean_items.append((title, price_value, link))
+        total += price_value
 
-    if not prices:
+    if not clean_items:
         return 0.0, []
 
-    avg_price = mean(prices)
-    cheap_items = [
-        (title, price, url)
-        for (title, price, url) in clean_items
-        if price < avg_price * threshold_ratio
-    ]
+    avg_price = total / len(clean_items)
+    limit = avg_price * threshold_ratio
+    cheap_items = [item for item in clean_items if item[1] < limit]
+
+    return avg_price, cheap_items
+
+
+def _to_float_or_nan(price_text: str) -> float:
+    """Like `_to_float`, but return NaN instead of raising."""
+    try:
+        return _to_float(price_text)
+    except ValueError:
+        return math.nan
+
+
+def _filter_cheap_items_numpy(
+    items: List[Item],
+    threshold_ratio: float,
+) -> Tuple[float, List[CleanItem]]:
+    """
+    NumPy path of `filter_cheap_items` for large inputs.
+
+    Prices are parsed straight into a float64 array (NaN if unparseable),
+    so (title, price, url) tuples are only built for the cheap items.
+    """
+    prices = np.fromiter(
+        (_to_float_or_nan(price_text) for _, price_text, _ in items),
+        dtype=np.float64,
+        count=len(items),
+    )
+    valid = ~np.isnan(prices)
+    if not valid.any():
+        return 0.0, []
+
+    avg_price = float(prices[valid].mean())
+    # NaN compares False, so unparseable prices never pass the mask
+    cheap_idx = np.flatnonzero(prices < avg_price * threshold_ratio)
+    cheap_items = [(items[i][0], float(prices[i]), items[i][2]) for i in cheap_idx]
 
     return avg_price, cheap_items
 
@@ -129,16 +181,166 @@ async def get_cheap_items(
             - average_price (float): Average of parsed prices.
             - cheap_items (list[CleanItem]): Filtered items below threshold.
 
+    Raises:
+        ValueError: If source is not supported.
+    """
+    items = await _fetch_items(source.lower().strip(), keyword, max_items)
+    return filter_cheap_items(items, threshold_ratio)
+
+
+async def _fetch_items(source_name: str, keyword: str, max_items: int) -> List[Item]:
+    """
+    Scrape raw items, reusing results of an identical scrape from the
+    last `FETCH_CACHE_TTL` seconds (e.g. when only the ratio changes).
+    Identical concurrent requests share a single scrape.
+
+    Raises:
+        ValueError: If source is not supported.
+    """
+    if source_name == "facebook":
+        scrape = scrape_facebook_marketplace_items
+    elif source_name == "ebay":
+        scrape = ebay_scraper
+    else:
+        raise ValueError(f"Unsupported source: {source_name!r}")
+
+    return await cached(
+        _fetch_cache,
+        _fetch_locks,
+        (source_name, keyword, max_items),
+        lambda: scrape(keyword, max_items),
+        FETCH_CACHE_TTL,
+        FETCH_CACHE_SIZE,
+        keep=bool,  # empty results usually mean a failed scrape; don't pin them
+    )
+
+
+async def iter_items(
+    source: str,
+    keyword: str,
+    max_items: int,
+) -> AsyncIterator[List[Item]]:
+    """
+    Yield raw items from a source in batches, as soon as each is scraped.
+
+    eBay yields one batch per result page; Facebook yields a single batch,
+    since its cards are extracted from the page in one go.
+
+    Args:
+        source (str): "facebook" or "ebay".
+        keyword (str): Search keyword.
+        max_items (int): Number of items/pages to fetch.
+
+    Yields:
+        list[Item]: A batch of (title, price_text, url).
+
     Raises:
         ValueError: If source is not supported.
     """
     source_name = source.lower().strip()
 
     if source_name == "facebook":
-        items = await scrape_facebook_marketplace_items(keyword, max_items)
+        yield await scrape_facebook_marketplace_items(keyword, max_items)
     elif source_name == "ebay":
-        items = await ebay_scraper(keyword, max_items)
+        pages = ebay_scraper_stream(keyword, max_items)
+        try:
+            async for batch in pages:
+                yield batch
+        finally:
+            await pages.aclose()
     else:
         raise ValueError(f"Unsupported source: {source!r}")
 
-    return filter_cheap_items(items, threshold_ratio)
+
+class RunningMean:
+    """
+    Incrementally updated mean (Welford's update), O(1) memory.
+    """
+
+    __slots__ = ("n", "m")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.m = 0.0
+
+    def add(self, x: float) -> None:
+        """Fold one value into the mean."""
+        self.n += 1
+        self.m += (x - self.m) / self.n
+
+
+async def filter_cheap_items_streaming(
+    batches: AsyncIterator[Iterable[Item]],
+    threshold_ratio: float,
+    warmup: int = 20,
+) -> AsyncIterator[Tuple[float, List[CleanItem]]]:
+    """
+    Streaming variant of `filter_cheap_items`.
+
+    Prices feed a running mean as batches arrive. Items are held back until
+    `warmup` prices have been seen (so the average is meaningful), then each
+    batch is filtered against the running average at that point.
+
+    Args:
+        batches (AsyncIterator[Iterable[Item]]): Batches of (title, price_text, url).
+        threshold_ratio (float): Ratio between 0 and 1.
+        warmup (int): Prices to collect before the first items are emitted.
+
+    Yields:
+        tuple:
+            - average_price (float): Running average when the items were judged.
+            - cheap_items (list[CleanItem]): Newly judged items below threshold.
+    """
+    running = RunningMean()
+    pending: Deque[CleanItem] = deque()
+
+    try:
+        async for batch in batches:
+            for title, price_text, link in batch:
+                try:
+                    price_value = _to_float(price_text)
+                except ValueError:
+                    continue  # skip unparseable prices
+                running.add(price_value)
+                pending.append((title, price_value, link))
+
+            if pending and running.n >= warmup:
+                limit = running.m * threshold_ratio
+                yield running.m, [item for item in pending if item[1] < limit]
+                pending.clear()
+    finally:
+        # Stop the upstream scrape too if the consumer quits early
+        aclose = getattr(batches, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    # Stream ended before warm-up completed: judge what we have
+    if pending:
+        limit = running.m * threshold_ratio
+        yield running.m, [item for item in pending if item[1] < limit]
+
+
+def stream_cheap_items(
+    source: str,
+    keyword: str,
+    max_items: int,
+    threshold_ratio: float,
+) -> AsyncIterator[Tuple[float, List[CleanItem]]]:
+    """
+    Streaming variant of `get_cheap_items`.
+
+    Deals are reported batch by batch as scraped pages arrive, judged
+    against the running average (see `filter_cheap_items_streaming`).
+
+    Args:
+        source (str): "facebook" or "ebay".
+        keyword (str): Search keyword.
+        max_items (int): Number of items/pages to fetch.
+        threshold_ratio (float): Ratio (0–1), e.g. 0.8 means 20% below average.
+
+    Returns:
+        AsyncIterator: (average_price, cheap_items) per judged batch.
+    """
+    return filter_cheap_items_streaming(
+        iter_items(source, keyword, max_items), threshold_ratio
+    )
@@ -9,21 +9,30 @@ This module provides helpers to:
 - Query the eBay Browse API for item summaries.
 
 Business logic:
+- A single shared HTTP client is reused for all requests (keep-alive, HTTP/2).
 - Cached app tokens are reused to avoid re-authentication.
 - Keyword is auto-resolved into a leaf category ID to reduce noise.
+- Taxonomy lookups (tree ID, keyword → category) are cached for 24h.
 """
 
 import asyncio
 import base64
-import json
 import logging
 import os
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 import httpx
 from dotenv import load_dotenv
 
+from cosmicreseller.cache import cached
+
+try:  # faster decoding of large Browse API pages when available
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional speedup
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 load_dotenv()
 
@@ -34,6 +43,11 @@ EBAY_CLIENT_SECRET = os.getenv("EBAY_CLIENT_SECRET")
 # OAuth & Browse
 TOKEN_URL = "https://api.ebay.com/identity/v1/oauth2/token"
 BROWSE_SEARCH_URL = "https://api.ebay.com/buy/browse/v1/item_summary/search"
+PAGE_LIMIT = 200  # Browse API maximum page size
+PAGE_CONCURRENCY = 5  # max concurrent page requests per scrape
+MAX_RESULT_WINDOW = 10_000  # Browse search only serves offset + limit ≤ 10,000
+# Response fields actually read by the scraper (pagination needs next/total)
+SEARCH_FIELDS = "itemSummaries(title,price,itemWebUrl),next,total"
 
 # Taxonomy
 TAXONOMY_DEFAULT_TREE_URL = (
@@ -43,42 +57,156 @@ TAXONOMY_SUGGEST_URL_TMPL = (
     "https://api.ebay.com/commerce/taxonomy/v1/category_tree/{tree_id}/get_category_suggestions"
 )
 
+# Shared HTTP client (lazily created, reused across all eBay calls)
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+# Taxonomy caches (TTL + LRU): key -> (expires_at, value), plus the locks of
+# lookups currently in flight per cache
+TAXONOMY_CACHE_TTL = 24 * 60 * 60
+TAXONOMY_CACHE_SIZE = 512
+_tree_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_tree_locks: dict[str, asyncio.Lock] = {}
+_cat_cache: "OrderedDict[tuple[str, str], tuple[float, tuple[Optional[str], Optional[str]]]]" = OrderedDict()
+_cat_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
 # Token cache
-_token_cache: dict[str, float | str | None] = {"value": None, "expires_at": 0}
+_token_cache: dict[str, float | str | None] = {
+    "value": None,
+    "expires_at": 0,
+    "refresh_token": None,
+}
+_token_lock = asyncio.Lock()
 TOKEN_SCOPE = "https://api.ebay.com/oauth/api_scope"
+TOKEN_RENEW_RATIO = 0.9
 
 
-async def get_app_token(scope: str = TOKEN_SCOPE) -> str:
+async def _get_client() -> httpx.AsyncClient:
     """
-    Get (and cache) an OAuth2 app token.
+    Return the shared eBay HTTP client, creating it on first use.
 
-    Args:
-        scope (str): OAuth2 scope to request.
+    A single keep-alive HTTP/2 client lets the token, taxonomy and browse
+    calls (all on api.ebay.com) reuse one connection instead of paying a
+    TCP + TLS handshake per request.
 
     Returns:
-        str: A valid app token.
+        httpx.AsyncClient: The shared client.
     """
-    now = time.time()
-    if _token_cache["value"] and now < _token_cache["expires_at"] - 60:
-        logger.debug("Using cached eBay app token.")
+    global _client
+    if _client is not None:
+        return _client
+
+    async with _client_lock:
+        if _client is None:
+            _client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(connect=5.0, read=20.0, write=10.0, pool=5.0),
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60,
+                ),
+            )
+    return _client
+
+
+async def close_clients() -> None:
+    """
+    Close the shared eBay HTTP client, if it was ever created.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _cached_token() -> Optional[str]:
+    """
+    Return the cached app token if it has not reached its renewal time.
+    """
+    if _token_cache["value"] and time.monotonic() < _token_cache["expires_at"]:
         return _token_cache["value"]  # type: ignore
+    return None
+
+
+async def _request_token(data: dict[str, str]) -> dict:
+    """
+    POST a grant to the eBay OAuth token endpoint.
+
+    Args:
+        data (dict): Form fields (grant type, scope, ...).
 
-    logger.info("Fetching new eBay app token...")
+    Returns:
+        dict: Token payload from eBay.
+    """
     auth = base64.b64encode(f"{EBAY_CLIENT_ID}:{EBAY_CLIENT_SECRET}".encode()).decode()
     headers = {
         "Authorization": f"Basic {auth}",
         "Content-Type": "application/x-www-form-urlencoded",
     }
-    data = {"grant_type": "client_credentials", "scope": scope}
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        resp = await client.post(TOKEN_URL, headers=headers, data=data)
-        resp.raise_for_status()
-        payload = resp.json()
+    client = await _get_client()
+    resp = await client.post(TOKEN_URL, headers=headers, data=data)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
+
+
+async def get_app_token(scope: str = TOKEN_SCOPE) -> str:
+    """
+    Get (and cache) an OAuth2 app token.
+
+    An expired token is renewed with the stored refresh token when eBay
+    issued one, falling back to the client-credentials grant. Concurrent
+    callers share a single renewal.
 
-    token = payload["access_token"]
-    expires_at = now + payload.get("expires_in", 0)
-    _token_cache.update({"value": token, "expires_at": expires_at})
+    Args:
+        scope (str): OAuth2 scope to request.
+
+    Returns:
+        str: A valid app token.
+    """
+    token = _cached_token()
+    if token:
+        logger.debug("Using cached eBay app token.")
+        return token
+
+    async with _token_lock:
+        # Another caller may have renewed the token while we waited
+        token = _cached_token()
+        if token:
+            return token
+
+        payload = None
+        refresh_token = _token_cache.get("refresh_token")
+        if refresh_token:
+            logger.info("Refreshing eBay app token...")
+            try:
+                payload = await _request_token(
+                    {
+                        "grant_type": "refresh_token",
+                        "refresh_token": refresh_token,
+                        "scope": scope,
+                    }
+                )
+            except httpx.HTTPError as err:
+                logger.warning("eBay token refresh failed, re-authenticating: %s", err)
+
+        if payload is None:
+            logger.info("Fetching new eBay app token...")
+            payload = await _request_token(
+                {"grant_type": "client_credentials", "scope": scope}
+            )
+
+        token = payload["access_token"]
+        # Renew after 90% of the lifetime, ahead of the real expiry
+        expires_at = time.monotonic() + payload.get("expires_in", 0) * TOKEN_RENEW_RATIO
+        _token_cache.update(
+            {
+                "value": token,
+                "expires_at": expires_at,
+                "refresh_token": payload.get("refresh_token", refresh_token),
+            }
+        )
 
     logger.debug("Received eBay app token, expires in %s seconds.", payload.get("expires_in"))
     return token
@@ -91,6 +219,26 @@ async def get_default_category_tree_id(marketplace_id: str = "EBAY_GB") -> str:
     Args:
         marketplace_id (str): eBay marketplace code (default "EBAY_GB").
 
+    Returns:
+        str: Category tree ID for the marketplace.
+    """
+    return await cached(
+        _tree_cache,
+        _tree_locks,
+        marketplace_id,
+        lambda: _fetch_default_category_tree_id(marketplace_id),
+        TAXONOMY_CACHE_TTL,
+        TAXONOMY_CACHE_SIZE,
+    )
+
+
+async def _fetch_default_category_tree_id(marketplace_id: str) -> str:
+    """
+    Fetch the default category tree ID for a marketplace (uncached).
+
+    Args:
+        marketplace_id (str): eBay marketplace code.
+
     Returns:
         str: Category tree ID for the marketplace.
     """
@@ -102,10 +250,10 @@ async def get_default_category_tree_id(marketplace_id: str = "EBAY_GB") -> str:
     }
     params = {"marketplace_id": marketplace_id}
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        resp = await client.get(TAXONOMY_DEFAULT_TREE_URL, headers=headers, params=params)
-        resp.raise_for_status()
-        payload = resp.json()
+    client = await _get_client()
+    resp = await client.get(TAXONOMY_DEFAULT_TREE_URL, headers=headers, params=params)
+    resp.raise_for_status()
+    payload = _json_loads(resp.content)
 
     return payload["categoryTreeId"]
 
@@ -124,6 +272,31 @@ async def get_category_id(
         tuple[str | None, str | None]: (category_id, category_name),
         or (None, None) if not found.
     """
+    key = (keyword.strip().lower(), marketplace_id)
+    return await cached(
+        _cat_cache,
+        _cat_locks,
+        key,
+        lambda: _fetch_category_id(keyword, marketplace_id),
+        TAXONOMY_CACHE_TTL,
+        TAXONOMY_CACHE_SIZE,
+    )
+
+
+async def _fetch_category_id(
+    keyword: str, marketplace_id: str
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    Fetch the top category suggestion for a keyword (uncached).
+
+    Args:
+        keyword (str): Search keyword to resolve.
+        marketplace_id (str): eBay marketplace code.
+
+    Returns:
+        tuple[str | None, str | None]: (category_id, category_name),
+        or (None, None) if eBay has no suggestion.
+    """
     token = await get_app_token()
     tree_id = await get_default_category_tree_id(marketplace_id)
 
@@ -135,10 +308,10 @@ async def get_category_id(
     params = {"q": keyword}
 
     url = TAXONOMY_SUGGEST_URL_TMPL.format(tree_id=tree_id)
-    async with httpx.AsyncClient(timeout=20) as client:
-        resp = await client.get(url, headers=headers, params=params)
-        resp.raise_for_status()
-        payload = resp.json()
+    client = await _get_client()
+    resp = await client.get(url, headers=headers, params=params)
+    resp.raise_for_status()
+    payload = _json_loads(resp.content)
 
     suggestions = payload.get("categorySuggestions", [])
     if not suggestions:
@@ -200,12 +373,12 @@ async def search_items(
 
     params: dict[str, str | int] = {
         "q": q,
-        "limit": min(int(limit), 200),
+        "limit": min(int(limit), PAGE_LIMIT),
         "offset": int(offset),
         "sort": sort,
-        "fieldgroups": (
-            "MATCHING_ITEMS,ASPECT_REFINEMENTS,CONDITION_REFINEMENTS,CATEGORY_REFINEMENTS"
-        ),
+        # Only item summaries are used; refinements would just add payload
+        "fieldgroups": "MATCHING_ITEMS",
+        "fields": SEARCH_FIELDS,
     }
 
     filters: list[str] = []
@@ -228,56 +401,154 @@ async def search_items(
     if aspect_filter:
         params["aspect_filter"] = aspect_filter
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        resp = await client.get(BROWSE_SEARCH_URL, headers=headers, params=params)
-        resp.raise_for_status()
-        return resp.json()
+    client = await _get_client()
+    resp = await client.get(BROWSE_SEARCH_URL, headers=headers, params=params)
+    resp.raise_for_status()
+    return _json_loads(resp.content)
 
 
-async def ebay_scraper(keyword: str, max_items: int) -> list[tuple[str, str, str]]:
+async def _first_page(keyword: str, max_items: int) -> tuple[dict, list[dict]]:
     """
-    Fetch items from eBay Browse API.
+    Fetch the first result page and plan the remaining page requests.
 
     Args:
         keyword (str): Search keyword.
         max_items (int): Maximum number of items to fetch.
 
     Returns:
-        list[tuple[str, str, str]]: List of (title, price_str, url) tuples.
+        tuple[dict, list[dict]]: First page payload, and `search_items`
+        kwargs for every remaining page (empty if there is only one page).
     """
     category_id, category_name = await get_category_id(keyword, marketplace_id="EBAY_GB")
 
+    search_kwargs = {
+        "q": keyword,
+        "sort": "best_match",
+        "buying_options": "FIXED_PRICE",
+        "category_id": category_id,
+        "conditions": ["USED", "NEW"],
+        "country": "GB",
+    }
+
+    first = await search_items(
+        limit=min(PAGE_LIMIT, max_items), offset=0, **search_kwargs
+    )
+
+    remaining: list[dict] = []
+    first_count = len(first.get("itemSummaries") or [])
+    if first_count and "next" in first:
+        end = min(int(first.get("total", max_items)), max_items, MAX_RESULT_WINDOW)
+        remaining = [
+            {"limit": min(PAGE_LIMIT, end - o), "offset": o, **search_kwargs}
+            for o in range(first_count, end, PAGE_LIMIT)
+        ]
+    return first, remaining
+
+
+def _page_fetcher() -> Callable[[dict], Awaitable[tuple[int, dict]]]:
+    """
+    Build a page fetcher that allows at most `PAGE_CONCURRENCY` requests
+    in flight, to stay within eBay's rate limits.
+
+    Returns:
+        Callable: Coroutine function mapping `search_items` kwargs to
+        (offset, page payload).
+    """
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def fetch(kwargs: dict) -> tuple[int, dict]:
+        async with semaphore:
+            return kwargs["offset"], await search_items(**kwargs)
+
+    return fetch
+
+
+async def _cancel_pending(tasks: list[asyncio.Task]) -> None:
+    """
+    Cancel page requests that are still running and wait for them to finish,
+    so none keep hitting eBay and no task exception goes unretrieved.
+    """
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _parse_page(page: dict, offset: int) -> list[tuple[str, str, str]]:
+    """
+    Normalize one Browse API page into (title, price_str, url) tuples.
+    """
     results: list[tuple[str, str, str]] = []
-    offset = 0
-    while offset < max_items:
-        page = await search_items(
-            q=keyword,
-            limit=min(200, max_items - offset),
-            offset=offset,
-            sort="best_match",
-            buying_options="FIXED_PRICE",
-            category_id=category_id,
-            conditions=["USED", "NEW"],
-            country="GB",
-        )
-        items = page.get("itemSummaries", []) or []
-        if not items:
-            break
+    items = page.get("itemSummaries", []) or []
+    for item in items:
+        title = item.get("title") or "N/A"
+        price = (item.get("price") or {}).get("value")
+        currency = (item.get("price") or {}).get("currency", "")
+        url = item.get("itemWebUrl") or "#"
+
+        if price:
+            results.append((title, f"{currency} {price}", url))
+
+    logger.info("Fetched %d items (offset=%d)", len(items), offset)
+    return results
 
-        for item in items:
-            title = item.get("title") or "N/A"
-            price = (item.get("price") or {}).get("value")
-            currency = (item.get("price") or {}).get("currency", "")
-            url = item.get("itemWebUrl") or "#"
 
-            if price:
-                results.append((title, f"{currency} {price}", url))
+async def ebay_scraper(keyword: str, max_items: int) -> list[tuple[str, str, str]]:
+    """
+    Fetch items from eBay Browse API.
 
-        logger.info("Fetched %d items (offset=%d)", len(items), offset)
+    The first page is fetched on its own to learn whether more results exist;
+    the remaining pages are then requested concurrently (at most
+    `PAGE_CONCURRENCY` at a time) and merged in offset order.
 
-        offset += len(items)
-        if "next" not in page:
-            break
+    Args:
+        keyword (str): Search keyword.
+        max_items (int): Maximum number of items to fetch.
+
+    Returns:
+        list[tuple[str, str, str]]: List of (title, price_str, url) tuples.
+    """
+    first, remaining = await _first_page(keyword, max_items)
+    fetch = _page_fetcher()
+    tasks = [asyncio.ensure_future(fetch(kwargs)) for kwargs in remaining]
+    try:
+        rest = await asyncio.gather(*tasks)
+    finally:
+        # A failed page leaves its siblings running otherwise
+        await _cancel_pending(tasks)
+
+    results = _parse_page(first, 0)
+    for offset, page in rest:
+        results.extend(_parse_page(page, offset))
 
     logger.info("Total collected: %d items", len(results))
     return results
+
+
+async def ebay_scraper_stream(
+    keyword: str, max_items: int
+) -> AsyncIterator[list[tuple[str, str, str]]]:
+    """
+    Like `ebay_scraper`, but yield items page by page as pages arrive.
+
+    Remaining pages are requested concurrently and yielded in completion
+    order, so callers can act on the fastest pages first.
+
+    Args:
+        keyword (str): Search keyword.
+        max_items (int): Maximum number of items to fetch.
+
+    Yields:
+        list[tuple[str, str, str]]: (title, price_str, url) tuples of one page.
+    """
+    first, remaining = await _first_page(keyword, max_items)
+    yield _parse_page(first, 0)
+
+    fetch = _page_fetcher()
+    tasks = [asyncio.ensure_future(fetch(kwargs)) for kwargs in remaining]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            offset, page = await next_page
+            yield _parse_page(page, offset)
+    finally:
+        # Also runs when a page fails or the consumer stops early
+        await _cancel_pending(tasks)
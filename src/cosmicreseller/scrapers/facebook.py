@@ -6,11 +6,19 @@ Facebook Marketplace scraper using Playwright (async).
 This module provides a function to scrape items from Facebook Marketplace
 based on a search keyword. It reuses a saved persistent Firefox profile
 (created via `scripts/create_fb_profile.py`) to bypass login prompts.
+
+The browser is launched once and kept alive; each scrape only opens (and
+closes) its own page. Call `close_browser()` on shutdown.
 """
 
+import asyncio
 import logging
 import urllib.parse
 from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import BrowserContext, Playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import async_playwright
 
 logger = logging.getLogger(__name__)
@@ -19,6 +27,67 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 PLAYWRIGHT_PROFILE = PROJECT_ROOT / "scripts" / "playwright_profile"
 
+FACEBOOK_BASE_URL = "https://www.facebook.com"
+
+# Listing cards and the JS used to read them in a single evaluation
+ITEM_SELECTOR = 'a[href^="/marketplace/item/"]'
+_EXTRACT_CARDS_JS = (
+    "els => els.map(e => ({href: e.getAttribute('href'), text: e.innerText}))"
+)
+_MORE_CARDS_JS = "([sel, n]) => document.querySelectorAll(sel).length > n"
+
+# Scrolling: stop once no new cards load within the timeout
+MAX_SCROLLS = 5
+SCROLL_TIMEOUT_MS = 2000
+
+# Shared browser (lazily launched, reused across scrapes)
+_playwright: Optional[Playwright] = None
+_context: Optional[BrowserContext] = None
+_browser_lock = asyncio.Lock()
+
+
+def _forget_context(_closed: BrowserContext) -> None:
+    """Drop the shared context if the browser goes away, so it is relaunched."""
+    global _context
+    _context = None
+
+
+async def _get_context() -> BrowserContext:
+    """
+    Return the shared persistent Firefox context, launching it on first use.
+
+    Returns:
+        BrowserContext: Persistent context using the saved Facebook profile.
+    """
+    global _playwright, _context
+    if _context is not None:
+        return _context
+
+    async with _browser_lock:
+        if _context is None:
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            logger.debug("Launching Firefox with persistent profile: %s", PLAYWRIGHT_PROFILE)
+            _context = await _playwright.firefox.launch_persistent_context(
+                PLAYWRIGHT_PROFILE,
+                headless=True,
+            )
+            _context.on("close", _forget_context)
+    return _context
+
+
+async def close_browser() -> None:
+    """
+    Close the shared browser context and stop Playwright, if running.
+    """
+    global _playwright, _context
+    if _context is not None:
+        await _context.close()
+        _context = None
+    if _playwright is not None:
+        await _playwright.stop()
+        _playwright = None
+
 
 async def scrape_facebook_marketplace_items(keyword: str, max_items: int):
     """
@@ -32,70 +101,72 @@ async def scrape_facebook_marketplace_items(keyword: str, max_items: int):
         list[tuple[str, str, str]]: A list of (title, price, url) tuples.
     """
     search_url = (
-        "https://www.facebook.com/marketplace/search/"
+        f"{FACEBOOK_BASE_URL}/marketplace/search/"
         f"?query={urllib.parse.quote(keyword)}"
     )
     items: list[tuple[str, str, str]] = []
-    seen_urls: set[str] = set()
 
     logger.info("Starting Facebook Marketplace scrape for keyword='%s'", keyword)
 
-    async with async_playwright() as playwright:
-        logger.debug("Launching Firefox with persistent profile: %s", PLAYWRIGHT_PROFILE)
-        context = await playwright.firefox.launch_persistent_context(
-            PLAYWRIGHT_PROFILE,
-            headless=True,
-        )
-        page = await context.new_page()
-
-        try:
-            logger.info("Navigating to search URL: %s", search_url)
-            await page.goto(search_url, timeout=30_000)
-            await page.wait_for_selector('a[href^="/marketplace/item/"]', timeout=30_000)
-
-            logger.debug("Scrolling to load more results...")
-            for _ in range(3):
-                await page.mouse.wheel(0, 2000)
-                await page.wait_for_timeout(1500)
-
-            cards = await page.query_selector_all('a[href^="/marketplace/item/"]')
-            logger.info("Found %d potential cards", len(cards))
-
-            for card in cards:
-                href = await card.get_attribute("href")
-                if not href:
-                    continue
-
-                full_url = urllib.parse.urljoin("https://www.facebook.com", href)
-                if full_url in seen_urls:
-                    continue
-                seen_urls.add(full_url)
-
-                try:
-                    text_block = await card.inner_text()
-                    if not text_block:
-                        continue
-
-                    parts = [t.strip() for t in text_block.split("\n") if t.strip()]
-                    price = parts[0] if len(parts) > 0 else "N/A"
-                    title = parts[1] if len(parts) > 1 else "N/A"
-                except Exception as parse_err:
-                    logger.warning("Failed to parse a card: %s", parse_err)
-                    continue
-
-                logger.debug("Parsed item: title='%s', price='%s'", title, price)
-                items.append((title, price, full_url))
-
-                if len(items) >= max_items:
-                    logger.info("Reached max_items limit (%d).", max_items)
-                    break
-
-        except Exception as scrape_err:
-            logger.error("Failed to load Facebook Marketplace: %s", scrape_err)
-            return []
-        finally:
-            logger.debug("Closing browser context.")
-            await context.close()
+    context = await _get_context()
+    page = await context.new_page()
+
+    try:
+        logger.info("Navigating to search URL: %s", search_url)
+        await page.goto(search_url, timeout=30_000)
+        await page.wait_for_selector(ITEM_SELECTOR, timeout=30_000)
+
+        logger.debug("Scrolling to load more results...")
+        loaded = await page.locator(ITEM_SELECTOR).count()
+        for _ in range(MAX_SCROLLS):
+            if loaded >= max_items:
+                break
+            await page.mouse.wheel(0, 2000)
+            try:
+                # Wait only until new cards show up, not a fixed delay
+                await page.wait_for_function(
+                    _MORE_CARDS_JS,
+                    arg=[ITEM_SELECTOR, loaded],
+                    timeout=SCROLL_TIMEOUT_MS,
+                )
+            except PlaywrightTimeoutError:
+                logger.debug("No new cards after scrolling; stopping.")
+                break
+            loaded = await page.locator(ITEM_SELECTOR).count()
+
+        # One browser round-trip for every card's href + text
+        rows = await page.eval_on_selector_all(ITEM_SELECTOR, _EXTRACT_CARDS_JS)
+        logger.info("Found %d potential cards", len(rows))
+
+        # Dedupe by href in one pass: first card wins, document order kept
+        unique_rows: dict[str, str] = {}
+        for row in rows:
+            if row.get("href"):
+                unique_rows.setdefault(row["href"], row.get("text") or "")
+
+        for href, text_block in unique_rows.items():
+            if not text_block:
+                continue
+
+            # Card links are site-relative paths; concatenation is enough
+            full_url = FACEBOOK_BASE_URL + href if href.startswith("/") else href
+            parts = [t.strip() for t in text_block.split("\n") if t.strip()]
+            price = parts[0] if len(parts) > 0 else "N/A"
+            title = parts[1] if len(parts) > 1 else "N/A"
+
+            logger.debug("Parsed item: title='%s', price='%s'", title, price)
+            items.append((title, price, full_url))
+
+            if len(items) >= max_items:
+                logger.info("Reached max_items limit (%d).", max_items)
+                break
+
+    except Exception as scrape_err:
+        logger.error("Failed to load Facebook Marketplace: %s", scrape_err)
+        return []
+    finally:
+        logger.debug("Closing page.")
+        await page.close()
 
     logger.info("Scraping finished. Collected %d items.", len(items))
     return items
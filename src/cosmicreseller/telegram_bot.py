@@ -8,15 +8,17 @@ Conversation flow:
 2. Ask for a search keyword.
 3. Ask for number of pages/items to fetch.
 4. Ask for a threshold ratio (0–1).
-5. Fetch items, filter cheap ones, and send formatted results to Telegram.
+5. Fetch items, filter cheap ones, and send formatted results to Telegram
+   as each batch of results arrives.
 """
 
+import asyncio
 import os
 import re
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-import aiohttp
+import httpx
 from dotenv import load_dotenv
 from telegram import Update
 from telegram.ext import (
@@ -28,9 +30,13 @@ from telegram.ext import (
     ContextTypes,
     filters,
 )
-from telegram_text import Link
 
-from src.cosmicreseller.pricing import get_cheap_items
+try:  # faster JSON encoding when available
+    from orjson import dumps as _json_dumps
+except ImportError:  # pragma: no cover - optional speedup
+    from json import dumps as _json_dumps
+
+from src.cosmicreseller.pricing import stream_cheap_items
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +48,50 @@ CHAT_ID = os.getenv("CHAT_ID")
 # Conversation states
 SOURCE, KEYWORD, MAX_PAGES, THRESHOLD_RATIO = range(4)
 
+# Characters that must be backslash-escaped in MarkdownV2 text
+_MD_ESCAPE_CHARS = r"\_*[]()~`>#+-=|{}.!"
+_MD_ESCAPE_RE = re.compile(f"([{re.escape(_MD_ESCAPE_CHARS)}])")
+# Inside a link's (...) part only ")" and "\\" must be escaped
+_MD_URL_ESCAPE_RE = re.compile(r"([)\\])")
+
+# Times a chunk is re-sent after a 429, waiting the `retry_after` Telegram asks for
+SEND_MAX_RETRIES = 3
+
+# Shared HTTP/2 client for the Bot API (lazily created)
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """
+    Return the shared Telegram HTTP client, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: Keep-alive HTTP/2 client for api.telegram.org.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    async with _client_lock:
+        if _client is None:
+            _client = httpx.AsyncClient(
+                http2=True,
+                timeout=20,
+                limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=60),
+            )
+    return _client
+
+
+async def close_client() -> None:
+    """
+    Close the shared Telegram HTTP client, if it was ever created.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 def escape_markdown_v2(text: str) -> str:
     """
@@ -53,8 +103,14 @@ def escape_markdown_v2(text: str) -> str:
     Returns:
         str: Escaped text safe for MarkdownV2.
     """
-    escape_chars = r"_*\[\]()~`>#+-=|{}.!,%-"
-    return re.sub(f"([{re.escape(escape_chars)}])", "", text)
+    return _MD_ESCAPE_RE.sub(r"\\\1", text)
+
+
+def _escape_link_url(url: str) -> str:
+    """
+    Escape a URL for the (...) part of a MarkdownV2 inline link.
+    """
+    return _MD_URL_ESCAPE_RE.sub(r"\\\1", url)
 
 
 def format_message(avg_price: float, cheap_items: List[Tuple[str, float, str]]) -> str:
@@ -69,16 +125,17 @@ def format_message(avg_price: float, cheap_items: List[Tuple[str, float, str]])
         str: MarkdownV2 formatted message for Telegram.
     """
     if not cheap_items:
-        return "No cheap items found."
-
-    lines = [f"*Average Market Price:* £{avg_price:.2f}\n*Deals found:*\n"]
+        return escape_markdown_v2("No cheap items found.")
 
-    for title, price, link in cheap_items:
-        safe_title = escape_markdown_v2(title)
-        formatted_link = Link(safe_title, link)
-        safe_price = escape_markdown_v2(f"£{price:.0f}")
-        lines.append(f"- {formatted_link} - {safe_price}\n")
+    safe_avg = escape_markdown_v2(f"£{avg_price:.2f}")
+    header = f"*Average Market Price:* {safe_avg}\n*Deals found:*\n"
 
+    # A whole-pound price ("£123") contains no special characters
+    lines = [header]
+    lines += [
+        f"\\- [{escape_markdown_v2(title)}]({_escape_link_url(link)}) \\- £{price:.0f}\n"
+        for title, price, link in cheap_items
+    ]
     return "".join(lines)
 
 
@@ -93,6 +150,8 @@ async def send_telegram_message(token: str, chat_id: str, message: str) -> None:
         message (str): Markdown-formatted message.
     """
     url = f"https://api.telegram.org/bot{token}/sendMessage"
+    # Telegram counts the limit after entity parsing, and escaped text is never
+    # shorter than what it renders to, so chunks of 4096 are always accepted
     max_len = 4096
 
     lines = message.splitlines(keepends=True)
@@ -108,11 +167,56 @@ async def send_telegram_message(token: str, chat_id: str, message: str) -> None:
     if chunk:
         chunks.append(chunk)
 
-    async with aiohttp.ClientSession() as session:
-        for c in chunks:
-            payload = {"chat_id": chat_id, "text": c, "parse_mode": "Markdown"}
-            resp = await session.post(url, data=payload)
-            resp.raise_for_status()
+    # Chunks are parts of one message, so they are sent in order
+    client = await _get_client()
+    for c in chunks:
+        payload = {
+            "chat_id": chat_id,
+            "text": c,
+            "parse_mode": "MarkdownV2",
+            "link_preview_options": {"is_disabled": True},
+        }
+        for attempt in range(SEND_MAX_RETRIES + 1):
+            resp = await client.post(
+                url,
+                content=_json_dumps(payload),
+                headers={"Content-Type": "application/json"},
+            )
+            if resp.status_code != 429 or attempt == SEND_MAX_RETRIES:
+                break
+            await asyncio.sleep(_retry_after(resp))
+        resp.raise_for_status()
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    """
+    Seconds Telegram asks us to wait after a 429 (1 if not given).
+    """
+    try:
+        return float(resp.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return 1.0
+
+
+async def _send_to_chat(message: str) -> bool:
+    """
+    Send a message to the configured chat, logging (not raising) failures.
+
+    Returns:
+        bool: True if the message was delivered.
+    """
+    try:
+        await send_telegram_message(TOKEN, CHAT_ID, message)
+    except httpx.HTTPError as exc:
+        # str(exc) holds the request URL, which embeds the bot token
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        logger.error(
+            "Sending Telegram message failed (%s, status=%s)",
+            type(exc).__name__,
+            status,
+        )
+        return False
+    return True
 
 
 # --- Conversation Handlers ---
@@ -183,16 +287,29 @@ async def handle_threshold(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"Searching {source.title()} for '{keyword}'... This may take a moment."
     )
 
+    # Deals are sent batch by batch as scraped pages arrive
+    found = False
+    message = None
+    deals = stream_cheap_items(source, keyword, max_pages, threshold_ratio)
     try:
-        avg_price, cheap_items = await get_cheap_items(
-            source, keyword, max_pages, threshold_ratio
-        )
-        message = format_message(avg_price, cheap_items)
+        async for avg_price, cheap_items in deals:
+            if cheap_items:
+                found = True
+                if not await _send_to_chat(format_message(avg_price, cheap_items)):
+                    break  # chat unreachable: stop scraping, nothing to report to
+        if not found:
+            message = format_message(0.0, [])
     except Exception as exc:
         logger.exception("Error while fetching deals")
-        message = f"Error occurred while fetching deals: {exc}"
-
-    await send_telegram_message(TOKEN, CHAT_ID, message)
+        # HTTP errors carry request URLs; keep their details in the log only
+        detail = "upstream request failed" if isinstance(exc, httpx.HTTPError) else exc
+        message = escape_markdown_v2(f"Error occurred while fetching deals: {detail}")
+    finally:
+        # Cancel outstanding page requests if sending failed mid-stream
+        await deals.aclose()
+
+    if message:
+        await _send_to_chat(message)
     return ConversationHandler.END
 
 
@@ -5,9 +5,18 @@ Web UI package for CosmicReseller.
 
 Exposes a Quart application factory (`create_app`) that registers the
 web UI blueprint and can be used by ASGI servers (e.g. Hypercorn).
+
+The scrapers keep shared resources alive across requests (the eBay
+HTTP/2 client and the Facebook Playwright browser); the app closes them
+when serving stops.
 """
 
+import os
+
+from jinja2 import FileSystemBytecodeCache
 from quart import Quart
+from cosmicreseller.scrapers.ebay import close_clients
+from cosmicreseller.scrapers.facebook import close_browser
 from cosmicreseller.webui.routes import bp
 
 
@@ -20,6 +29,25 @@ def create_app() -> Quart:
     """
     app = Quart(__name__)
     app.register_blueprint(bp)
+
+    # Directory for compiled templates, kept across restarts (off if unset)
+    app.config["TEMPLATE_CACHE_DIR"] = os.getenv("TEMPLATE_CACHE_DIR")
+
+    @app.before_serving
+    async def startup() -> None:
+        cache_dir = app.config["TEMPLATE_CACHE_DIR"]
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+        # Compile the page once up front instead of on the first request
+        app.jinja_env.get_template("index.html")
+
+    @app.after_serving
+    async def shutdown() -> None:
+        await close_clients()
+        await close_browser()
+
     return app
 
 
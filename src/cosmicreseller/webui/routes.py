@@ -7,7 +7,16 @@ Shows a simple form to search Facebook Marketplace or eBay and displays
 items priced below a user-defined threshold.
 """
 
-from quart import Blueprint, render_template, request
+import hashlib
+
+from quart import (
+    Blueprint,
+    Response,
+    current_app,
+    render_template,
+    request,
+    stream_template,
+)
 from cosmicreseller.pricing import get_cheap_items
 
 bp = Blueprint(
@@ -17,6 +26,45 @@ bp = Blueprint(
     static_folder="static",
 )
 
+_ALLOWED_SOURCES: frozenset[str] = frozenset(("facebook", "ebay"))
+
+# Form defaults (also shown on GET)
+_DEFAULTS = {
+    "source": "facebook",
+    "keyword": "",
+    "max_items": 1,
+    "threshold_ratio": 0.8,
+}
+
+
+async def _index_get_response() -> Response:
+    """
+    Serve the default (GET) page from a per-app cache, with an ETag.
+
+    The GET page is identical for every visitor, so it is rendered once on
+    first request; repeat visits with a matching If-None-Match get a 304.
+    """
+    cached = current_app.extensions.get("index_get")
+    if cached is None:
+        body = await render_template(
+            "index.html",
+            source=_DEFAULTS["source"],
+            keyword=_DEFAULTS["keyword"],
+            max_pages=_DEFAULTS["max_items"],
+            threshold_ratio=_DEFAULTS["threshold_ratio"],
+            error=None,
+            avg_price=None,
+            items=[],
+        )
+        data = body.encode()
+        cached = (data, hashlib.sha1(data).hexdigest())
+        current_app.extensions["index_get"] = cached
+
+    data, etag = cached
+    response = Response(data, mimetype="text/html")
+    response.set_etag(etag)
+    return await response.make_conditional(request)
+
 
 @bp.route("/", methods=["GET", "POST"])
 async def index():
@@ -28,43 +76,53 @@ async def index():
     POST:
         Validate input, run the scraper/orchestrator, and render results.
     """
-    # Defaults
-    source = "facebook"
-    keyword = ""
-    max_items = 1
-    threshold_ratio = 0.8
+    if request.method != "POST":  # GET, and Quart's automatic HEAD
+        return await _index_get_response()
+
+    source = _DEFAULTS["source"]
+    keyword = _DEFAULTS["keyword"]
+    max_items = _DEFAULTS["max_items"]
+    threshold_ratio = _DEFAULTS["threshold_ratio"]
     error = None
     avg_price = None
     items = []
 
-    if request.method == "POST":
-        form = await request.form
-        try:
-            source = (form.get("source") or "").strip().lower()
-            keyword = (form.get("keyword") or "").strip()
-            max_items = int(form.get("max_items") or 1)
-            threshold_ratio = float(form.get("threshold_ratio") or 0.8)
-
-            if source not in {"facebook", "ebay"}:
-                raise ValueError("Source must be 'facebook' or 'ebay'.")
-            if not keyword:
-                raise ValueError("Keyword cannot be empty.")
-            if max_items < 1:
-                raise ValueError("Max pages must be ≥ 1.")
-            if not (0 < threshold_ratio < 1):
-                raise ValueError(
-                    "Threshold ratio must be between 0 and 1 (e.g., 0.8)."
-                )
-
-            # Orchestrate and fetch results
-            avg_price, items = await get_cheap_items(
-                source, keyword, max_items, threshold_ratio
+    form = await request.form
+    try:
+        # Canonical values (the common case) are used as-is, without
+        # allocating stripped/lowered copies
+        source = form.get("source") or ""
+        if source not in _ALLOWED_SOURCES:
+            source = source.strip().lower()
+        keyword = form.get("keyword") or ""
+        if keyword and (keyword[0].isspace() or keyword[-1].isspace()):
+            keyword = keyword.strip()
+        raw = form.get("max_items")
+        max_items = int(raw) if raw else _DEFAULTS["max_items"]
+        raw = form.get("threshold_ratio")
+        threshold_ratio = float(raw) if raw else _DEFAULTS["threshold_ratio"]
+
+        if source not in _ALLOWED_SOURCES:
+            raise ValueError("Source must be 'facebook' or 'ebay'.")
+        if not keyword:
+            raise ValueError("Keyword cannot be empty.")
+        if max_items < 1:
+            raise ValueError("Max pages must be ≥ 1.")
+        if not (0 < threshold_ratio < 1):
+            raise ValueError(
+                "Threshold ratio must be between 0 and 1 (e.g., 0.8)."
             )
 
-        except Exception as exc:
-            error = str(exc)
+        # Orchestrate and fetch results
+        avg_price, items = await get_cheap_items(
+            source, keyword, max_items, threshold_ratio
+        )
+
+    except Exception as exc:
+        error = str(exc)
 
-    return await render_template(
+    # Stream the page: the head and form are sent while result rows render
+    return await stream_template(
         "index.html",
         source=source,
         keyword=keyword,
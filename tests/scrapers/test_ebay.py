@@ -1,55 +1,92 @@
+import asyncio
+import json
+from collections import OrderedDict
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 from cosmicreseller.scrapers import ebay as ebay_mod
 
 
+def _item(title, value="1", url="u"):
+    """One Browse API item summary."""
+    return {"title": title, "price": {"value": value, "currency": "GBP"}, "itemWebUrl": url}
+
+
+def _page(*items, total=None, next=True):
+    """One Browse API search page holding `items`."""
+    page = {"itemSummaries": list(items)}
+    if total is not None:
+        page["total"] = total
+    if next:
+        page["next"] = "exists"
+    return page
+
+
+async def _hang(offset, cancelled):
+    """Block until cancelled, recording the page offset."""
+    try:
+        await asyncio.sleep(10)
+    except asyncio.CancelledError:
+        cancelled.append(offset)
+        raise
+
+
+@pytest.fixture
+def stub_category(monkeypatch):
+    """Stub category resolution (avoid real taxonomy calls)."""
+    async def fake_get_category_id(keyword, marketplace_id="EBAY_GB"):
+        return ("123", "TestCat")
+
+    monkeypatch.setattr(ebay_mod, "get_category_id", fake_get_category_id)
+
+
 @pytest.mark.asyncio
-async def test_get_app_token_mocks_http():
+async def test_get_app_token_mocks_http(monkeypatch):
     # Fake POST response payload from eBay
     fake_payload = {"access_token": "FAKE_TOKEN", "expires_in": 7200}
 
     class FakeResp:
+        content = json.dumps(fake_payload).encode()
         def raise_for_status(self): pass
-        def json(self): return fake_payload
 
     async def fake_post(url, headers=None, data=None):
         assert "identity/v1/oauth2/token" in url
         return FakeResp()
 
-    with patch.object(httpx, "AsyncClient") as client_cls:
-        client = client_cls.return_value.__aenter__.return_value
-        client.post = AsyncMock(side_effect=fake_post)
+    # Swap the shared client for a stub (no real HTTP)
+    client = MagicMock(spec=httpx.AsyncClient)
+    client.post = AsyncMock(side_effect=fake_post)
+    monkeypatch.setattr(ebay_mod, "_client", client)
+    monkeypatch.setattr(ebay_mod, "_token_cache", {"value": None, "expires_at": 0})
+
+    token = await ebay_mod.get_app_token()
+    assert token == "FAKE_TOKEN"
+
+    # Second call is served from the token cache on the same client
+    assert await ebay_mod.get_app_token() == "FAKE_TOKEN"
+    assert client.post.await_count == 1
 
-        token = await ebay_mod.get_app_token()
-        assert token == "FAKE_TOKEN"
 
 @pytest.mark.asyncio
-async def test_ebay_scraper_uses_stubs(monkeypatch):
-    # Stub category resolution (avoid real taxonomy call)
-    async def fake_get_category_id(keyword, marketplace_id="EBAY_GB"):
-        return ("123", "TestCat")
+async def test_close_clients_resets_shared_client(monkeypatch):
+    client = MagicMock(spec=httpx.AsyncClient)
+    client.aclose = AsyncMock()
+    monkeypatch.setattr(ebay_mod, "_client", client)
+
+    await ebay_mod.close_clients()
+    client.aclose.assert_awaited_once()
+    assert ebay_mod._client is None
+
 
+@pytest.mark.asyncio
+async def test_ebay_scraper_uses_stubs(monkeypatch, stub_category):
     # Stub search_items pagination: return two pages then stop.
     async def fake_search_items(**kwargs):
-        offset = kwargs.get("offset", 0)
-        if offset == 0:
-            return {
-                "itemSummaries": [
-                    {"title": "Thing 1", "price": {"value": "10", "currency": "GBP"}, "itemWebUrl": "u1"},
-                    {"title": "Thing 2", "price": {"value": "20", "currency": "GBP"}, "itemWebUrl": "u2"},
-                ],
-                "next": "exists",
-            }
-        else:
-            return {
-                "itemSummaries": [
-                    {"title": "Thing 3", "price": {"value": "30", "currency": "GBP"}, "itemWebUrl": "u3"},
-                ]
-            }
+        if kwargs.get("offset", 0) == 0:
+            return _page(_item("Thing 1", "10", "u1"), _item("Thing 2", "20", "u2"))
+        return _page(_item("Thing 3", "30", "u3"), next=False)
 
-    monkeypatch.setattr(ebay_mod, "get_category_id", fake_get_category_id)
     monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
 
     items = await ebay_mod.ebay_scraper("ps4", max_items=5)
@@ -59,3 +96,185 @@ async def test_ebay_scraper_uses_stubs(monkeypatch):
         ("Thing 2", "GBP 20", "u2"),
         ("Thing 3", "GBP 30", "u3"),
     ]
+
+
+@pytest.mark.asyncio
+async def test_ebay_scraper_fetches_remaining_pages_from_total(monkeypatch, stub_category):
+    calls = []
+
+    async def fake_search_items(**kwargs):
+        offset, limit = kwargs["offset"], kwargs["limit"]
+        calls.append((offset, limit))
+        titles = [f"T{offset + i}" for i in range(min(limit, 450 - offset))]
+        return _page(*map(_item, titles), total=450)
+
+    monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
+
+    items = await ebay_mod.ebay_scraper("ps4", max_items=1000)
+    assert sorted(calls) == [(0, 200), (200, 200), (400, 50)]
+    assert [t for t, _, _ in items] == [f"T{i}" for i in range(450)]
+
+
+@pytest.mark.asyncio
+async def test_ebay_scraper_stops_at_result_window(monkeypatch, stub_category):
+    calls = []
+
+    async def fake_search_items(**kwargs):
+        offset, limit = kwargs["offset"], kwargs["limit"]
+        if offset + limit > ebay_mod.MAX_RESULT_WINDOW:
+            raise httpx.HTTPStatusError("offset too large", request=None, response=None)
+        calls.append(offset)
+        return _page(*[_item("T")] * limit, total=50_000)
+
+    monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
+
+    items = await ebay_mod.ebay_scraper("ps4", max_items=12_000)
+    assert len(items) == ebay_mod.MAX_RESULT_WINDOW
+    assert max(calls) == ebay_mod.MAX_RESULT_WINDOW - ebay_mod.PAGE_LIMIT
+
+
+@pytest.mark.asyncio
+async def test_get_category_id_is_cached(monkeypatch):
+    calls = []
+
+    async def fake_fetch(keyword, marketplace_id):
+        calls.append(keyword)
+        return ("123", "TestCat")
+
+    monkeypatch.setattr(ebay_mod, "_fetch_category_id", fake_fetch)
+    monkeypatch.setattr(ebay_mod, "_cat_cache", OrderedDict())
+    monkeypatch.setattr(ebay_mod, "_cat_locks", {})
+
+    results = await asyncio.gather(
+        *(ebay_mod.get_category_id("PS4 ") for _ in range(3)),
+        ebay_mod.get_category_id("ps4"),
+    )
+    assert results == [("123", "TestCat")] * 4
+    assert calls == ["PS4 "]  # concurrent callers share one lookup
+    assert ebay_mod._cat_locks == {}  # in-flight lock released
+
+
+@pytest.mark.asyncio
+async def test_category_cache_is_bounded_and_expires(monkeypatch):
+    calls = []
+
+    async def fake_fetch(keyword, marketplace_id):
+        calls.append(keyword)
+        return (keyword, "TestCat")
+
+    monkeypatch.setattr(ebay_mod, "_fetch_category_id", fake_fetch)
+    monkeypatch.setattr(ebay_mod, "_cat_cache", OrderedDict())
+    monkeypatch.setattr(ebay_mod, "_cat_locks", {})
+    monkeypatch.setattr(ebay_mod, "TAXONOMY_CACHE_SIZE", 2)
+
+    for keyword in ("a", "b", "a", "c"):
+        await ebay_mod.get_category_id(keyword)
+    # "b" was least recently used when "c" arrived
+    assert [k for k, _ in ebay_mod._cat_cache] == ["a", "c"]
+
+    monkeypatch.setattr(ebay_mod, "TAXONOMY_CACHE_TTL", -1)
+    await ebay_mod.get_category_id("d")
+    await ebay_mod.get_category_id("d")  # expired immediately: fetched again
+    assert calls == ["a", "b", "c", "d", "d"]
+
+
+@pytest.mark.asyncio
+async def test_get_app_token_prefers_refresh_token(monkeypatch):
+    grants = []
+
+    class FakeResp:
+        content = b'{"access_token": "REFRESHED", "expires_in": 7200}'
+        def raise_for_status(self): pass
+
+    async def fake_post(url, headers=None, data=None):
+        grants.append(data["grant_type"])
+        return FakeResp()
+
+    client = MagicMock(spec=httpx.AsyncClient)
+    client.post = AsyncMock(side_effect=fake_post)
+    monkeypatch.setattr(ebay_mod, "_client", client)
+    monkeypatch.setattr(
+        ebay_mod,
+        "_token_cache",
+        {"value": "OLD", "expires_at": 0, "refresh_token": "R1"},
+    )
+
+    tokens = await asyncio.gather(*(ebay_mod.get_app_token() for _ in range(5)))
+    assert tokens == ["REFRESHED"] * 5
+    assert grants == ["refresh_token"]  # one renewal shared by all callers
+    assert ebay_mod._token_cache["refresh_token"] == "R1"
+
+
+@pytest.mark.asyncio
+async def test_ebay_scraper_stream_yields_each_page(monkeypatch, stub_category):
+    async def fake_search_items(**kwargs):
+        title = f"T{kwargs['offset']}"
+        return _page(*[_item(title)] * min(kwargs["limit"], 2), total=6)
+
+    monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
+    monkeypatch.setattr(ebay_mod, "PAGE_LIMIT", 2)
+
+    batches = [batch async for batch in ebay_mod.ebay_scraper_stream("ps4", max_items=6)]
+    assert batches[0] == [("T0", "GBP 1", "u")] * 2  # first page always first
+    assert sorted(batch[0][0] for batch in batches) == ["T0", "T2", "T4"]
+
+
+@pytest.mark.asyncio
+async def test_ebay_scraper_caps_concurrent_page_requests(monkeypatch, stub_category):
+    in_flight = 0
+    peak = 0
+
+    async def fake_search_items(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return _page(_item(f"T{kwargs['offset']}"), total=20)
+
+    monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
+    monkeypatch.setattr(ebay_mod, "PAGE_LIMIT", 1)
+
+    items = await ebay_mod.ebay_scraper("ps4", max_items=20)
+    assert [t for t, _, _ in items] == [f"T{i}" for i in range(20)]
+    assert peak == ebay_mod.PAGE_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_ebay_scraper_cancels_pages_after_failure(monkeypatch, stub_category):
+    cancelled = []
+
+    async def fake_search_items(**kwargs):
+        offset = kwargs["offset"]
+        if offset == 1:
+            raise httpx.HTTPError("boom")
+        if offset > 1:
+            await _hang(offset, cancelled)
+        return _page(_item("T"), total=4)
+
+    monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
+    monkeypatch.setattr(ebay_mod, "PAGE_LIMIT", 1)
+
+    with pytest.raises(httpx.HTTPError):
+        await ebay_mod.ebay_scraper("ps4", max_items=4)
+    assert sorted(cancelled) == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_ebay_scraper_stream_cancels_pages_when_closed_early(monkeypatch, stub_category):
+    cancelled = []
+
+    async def fake_search_items(**kwargs):
+        offset = kwargs["offset"]
+        if offset > 1:
+            await _hang(offset, cancelled)
+        return _page(_item(f"T{offset}"), total=4)
+
+    monkeypatch.setattr(ebay_mod, "search_items", fake_search_items)
+    monkeypatch.setattr(ebay_mod, "PAGE_LIMIT", 1)
+
+    pages = ebay_mod.ebay_scraper_stream("ps4", max_items=4)
+    assert await pages.__anext__() == [("T0", "GBP 1", "u")]
+    assert await pages.__anext__() == [("T1", "GBP 1", "u")]
+    await pages.aclose()
+    assert sorted(cancelled) == [2, 3]
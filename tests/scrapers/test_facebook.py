@@ -11,11 +11,6 @@ async def test_scrape_facebook_marketplace_items_with_stubbed_playwright(monkeyp
         def __init__(self, href, text):
             self._href = href
             self._text = text
-        async def get_attribute(self, name):
-            assert name == "href"
-            return self._href
-        async def inner_text(self):
-            return self._text
 
     cards = [
         FakeCard("/marketplace/item/1", "£10\nCool Item"),
@@ -30,24 +25,38 @@ async def test_scrape_facebook_marketplace_items_with_stubbed_playwright(monkeyp
         class mouse:
             @staticmethod
             async def wheel(x, y): return None
-        async def wait_for_timeout(self, ms): return None
-        async def query_selector_all(self, sel): return cards
+        async def wait_for_function(self, js, arg=None, timeout=None): return None
+        def locator(self, sel):
+            return SimpleNamespace(count=AsyncMock(return_value=len(cards)))
+        async def close(self): return None
+        async def eval_on_selector_all(self, sel, js):
+            assert sel == 'a[href^="/marketplace/item/"]'
+            return [{"href": c._href, "text": c._text} for c in cards]
 
     class FakeContext:
-        async def new_page(self): return FakePage()
+        def __init__(self): self.pages = 0
+        async def new_page(self):
+            self.pages += 1
+            return FakePage()
+        def on(self, event, handler): pass
         async def close(self): return None
 
+    launches = []
+
     class FakeFirefox:
         async def launch_persistent_context(self, *_args, **_kwargs):
-            return FakeContext()
+            launches.append(FakeContext())
+            return launches[-1]
 
-    # async_playwright() context manager stub
+    # async_playwright().start() stub
     class FakeAP:
         def __init__(self): self.firefox = FakeFirefox()
-        async def __aenter__(self): return self
-        async def __aexit__(self, exc_type, exc, tb): return False
+        async def start(self): return self
+        async def stop(self): return None
 
     monkeypatch.setattr(fb_mod, "async_playwright", lambda: FakeAP())
+    monkeypatch.setattr(fb_mod, "_playwright", None)
+    monkeypatch.setattr(fb_mod, "_context", None)
 
     items = await fb_mod.scrape_facebook_marketplace_items("ps4", max_items=10)
     # Should dedupe URL 1
@@ -55,3 +64,10 @@ async def test_scrape_facebook_marketplace_items_with_stubbed_playwright(monkeyp
         ("Cool Item", "£10", "https://www.facebook.com/marketplace/item/1"),
         ("Another One", "£20", "https://www.facebook.com/marketplace/item/2"),
     ]
+
+    # A second scrape reuses the running browser and only opens a new page
+    await fb_mod.scrape_facebook_marketplace_items("ps4", max_items=10)
+    assert len(launches) == 1 and launches[0].pages == 2
+
+    await fb_mod.close_browser()
+    assert fb_mod._context is None and fb_mod._playwright is None
@@ -1,3 +1,4 @@
+import asyncio
 import math
 import pytest
 
@@ -12,6 +13,9 @@ from cosmicreseller import pricing
         ("€999.99", 999.99),
         ("$2,000", 2000.0),
         ("2000", 2000.0),
+        ("€1.234,50", 1234.50),
+        ("GBP 12.30", 12.30),
+        ("1,23", 1.23),
     ],
 )
 def test_to_float_happy(text, expected):
@@ -21,7 +25,7 @@ def test_to_float_happy(text, expected):
 @pytest.mark.parametrize("bad", ["N/A", "free", "—", "", "abc"])
 def test_to_float_raises(bad):
     with pytest.raises(ValueError):
-        core._to_float(bad)
+        pricing._to_float(bad)
 
 
 def test_filter_cheap_items_threshold_0_8():
@@ -41,3 +45,129 @@ def test_filter_cheap_items_no_prices():
     avg, cheap = pricing.filter_cheap_items(items, threshold_ratio=0.8)
     assert avg == 0.0
     assert cheap == []
+
+
+def test_filter_cheap_items_large_input_matches_small_path():
+    items = [(f"T{i}", f"£{i % 100 + 1}", f"u{i}") for i in range(1000)]
+    items += [("Bad", "N/A", "u-bad")] * 10  # unparseable, must be skipped
+    avg, cheap = pricing.filter_cheap_items(items, threshold_ratio=0.5)
+    # prices 1..100 repeated → avg 50.5, threshold 25.25
+    assert avg == pytest.approx(50.5)
+    assert cheap == [
+        (title, float(i % 100 + 1), f"u{i}")
+        for i, (title, _, _) in enumerate(items[:1000])
+        if i % 100 + 1 < 25.25
+    ]
+    assert all(type(price) is float for _, price, _ in cheap)
+
+
+def test_running_mean():
+    rm = pricing.RunningMean()
+    for x in (100.0, 200.0, 300.0, 400.0):
+        rm.add(x)
+    assert rm.n == 4
+    assert rm.m == pytest.approx(250.0)
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+@pytest.mark.asyncio
+async def test_filter_cheap_items_streaming_uses_running_average():
+    batches = _batches(
+        [("A", "£100", "u1"), ("B", "£300", "u2")],
+        [("C", "N/A", "u3")],  # nothing parseable → nothing emitted
+        [("D", "£50", "u4"), ("E", "£350", "u5")],
+    )
+    results = [
+        r async for r in pricing.filter_cheap_items_streaming(batches, 0.8, warmup=2)
+    ]
+    # batch 1: avg 200 → 100 < 160; batch 3: avg 200 → 50 < 160
+    assert results == [
+        (pytest.approx(200.0), [("A", 100.0, "u1")]),
+        (pytest.approx(200.0), [("D", 50.0, "u4")]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_cheap_items_holds_items_until_warmup(monkeypatch):
+    monkeypatch.setattr(
+        pricing,
+        "iter_items",
+        lambda source, keyword, max_items: _batches(
+            [("A", "£100", "u1"), ("B", "£300", "u2")],
+            [("D", "£50", "u4"), ("E", "£350", "u5")],
+        ),
+    )
+
+    results = [
+        r async for r in pricing.stream_cheap_items("ebay", "ps4", 10, threshold_ratio=0.8)
+    ]
+    # Fewer prices than the warm-up: everything is judged once at the end
+    assert results == [
+        (pytest.approx(200.0), [("A", 100.0, "u1"), ("D", 50.0, "u4")]),
+    ]
+
+
+def test_filter_cheap_items_large_input_no_prices():
+    items = [("A", "N/A", "u1")] * 600
+    assert pricing.filter_cheap_items(items, threshold_ratio=0.8) == (0.0, [])
+
+
+@pytest.mark.asyncio
+async def test_get_cheap_items_reuses_recent_scrape(monkeypatch):
+    from collections import OrderedDict
+
+    calls = []
+
+    async def fake_ebay_scraper(keyword, max_items):
+        calls.append((keyword, max_items))
+        return [("A", "£100", "u1"), ("B", "£200", "u2"), ("C", "£600", "u3")]
+
+    monkeypatch.setattr(pricing, "ebay_scraper", fake_ebay_scraper)
+    monkeypatch.setattr(pricing, "_fetch_cache", OrderedDict())
+
+    # avg = 300: ratio 0.5 → below 150, ratio 0.7 → below 210
+    assert await pricing.get_cheap_items("ebay", "ps4", 3, 0.5) == (
+        pytest.approx(300.0), [("A", 100.0, "u1")]
+    )
+    # Only the ratio changed → no second scrape
+    avg, cheap = await pricing.get_cheap_items("eBay ", "ps4", 3, 0.7)
+    assert cheap == [("A", 100.0, "u1"), ("B", 200.0, "u2")]
+    assert calls == [("ps4", 3)]
+
+    await pricing.get_cheap_items("ebay", "ps5", 3, 0.8)
+    assert calls == [("ps4", 3), ("ps5", 3)]
+
+
+@pytest.mark.asyncio
+async def test_get_cheap_items_unsupported_source():
+    with pytest.raises(ValueError):
+        await pricing.get_cheap_items("amazon", "ps4", 3, 0.8)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_scrapes_share_one_fetch(monkeypatch):
+    from collections import OrderedDict
+
+    calls = []
+
+    async def fake_ebay_scraper(keyword, max_items):
+        calls.append(keyword)
+        await asyncio.sleep(0)
+        return [] if keyword == "none" else [("A", "£100", "u1")]
+
+    monkeypatch.setattr(pricing, "ebay_scraper", fake_ebay_scraper)
+    monkeypatch.setattr(pricing, "_fetch_cache", OrderedDict())
+    monkeypatch.setattr(pricing, "_fetch_locks", {})
+
+    await asyncio.gather(*(pricing.get_cheap_items("ebay", "ps4", 1, 0.8) for _ in range(3)))
+    assert calls == ["ps4"]
+
+    # Empty results are not cached
+    await pricing.get_cheap_items("ebay", "none", 1, 0.8)
+    await pricing.get_cheap_items("ebay", "none", 1, 0.8)
+    assert calls == ["ps4", "none", "none"]
+    assert pricing._fetch_locks == {}
@@ -0,0 +1,121 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from cosmicreseller import telegram_bot as tg
+from cosmicreseller.telegram_bot import escape_markdown_v2, format_message
+
+
+def test_escape_markdown_v2_escapes_special_chars():
+    assert escape_markdown_v2("_*[]().!\\") == r"\_\*\[\]\(\)\.\!\\"
+    assert escape_markdown_v2("PS4 slim") == "PS4 slim"
+
+
+def test_format_message_escapes_header_and_lines():
+    msg = format_message(1234.5, [("PS4 (used)!", 12.0, "https://example.com/a")])
+    lines = msg.splitlines()
+    assert lines[0] == r"*Average Market Price:* £1234\.50"
+    assert lines[1] == "*Deals found:*"
+    assert lines[2] == r"\- [PS4 \(used\)\!](https://example.com/a) \- £12"
+
+
+def test_format_message_escapes_backslash_in_title():
+    msg = format_message(50.0, [("USB cable 1m \\", 5.0, "https://example.com/u")])
+    assert msg.splitlines()[2] == r"\- [USB cable 1m \\](https://example.com/u) \- £5"
+
+
+def test_format_message_escapes_link_url():
+    msg = format_message(50.0, [("Lamp", 5.0, r"https://example.com/a_(b)\c")])
+    assert msg.splitlines()[2] == r"\- [Lamp](https://example.com/a_(b\)\\c) \- £5"
+
+
+def test_format_message_no_items():
+    assert format_message(0.0, []) == r"No cheap items found\."
+
+
+class FakeMessage:
+    def __init__(self, text):
+        self.text = text
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+class FakeUpdate:
+    def __init__(self, text):
+        self.message = FakeMessage(text)
+
+
+class FakeContext:
+    def __init__(self):
+        self.user_data = {"source": "ebay", "keyword": "ps4", "max_pages": 2}
+
+
+def _token_leaking_error():
+    request = httpx.Request("POST", "https://api.telegram.org/bot123456:SECRET/sendMessage")
+    response = httpx.Response(429, request=request)
+    return httpx.HTTPStatusError(f"429 for url {request.url}", request=request, response=response)
+
+
+@pytest.mark.asyncio
+async def test_handle_threshold_send_failure_is_not_echoed(monkeypatch):
+    sent = []
+    closed = []
+
+    async def fake_stream(source, keyword, max_items, threshold_ratio):
+        try:
+            yield 100.0, [("A", 50.0, "https://example.com/a")]
+            yield 100.0, [("B", 50.0, "https://example.com/b")]
+        finally:
+            closed.append(True)
+
+    async def fake_send(token, chat_id, message):
+        sent.append(message)
+        raise _token_leaking_error()
+
+    monkeypatch.setattr(tg, "stream_cheap_items", fake_stream)
+    monkeypatch.setattr(tg, "send_telegram_message", fake_send)
+
+    result = await tg.handle_threshold(FakeUpdate("0.8"), FakeContext())
+    assert result == tg.ConversationHandler.END
+    assert len(sent) == 1  # no error report, no further batches
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_handle_threshold_hides_http_error_details(monkeypatch):
+    sent = []
+
+    async def fake_stream(source, keyword, max_items, threshold_ratio):
+        raise _token_leaking_error()
+        yield  # pragma: no cover
+
+    async def fake_send(token, chat_id, message):
+        sent.append(message)
+
+    monkeypatch.setattr(tg, "stream_cheap_items", fake_stream)
+    monkeypatch.setattr(tg, "send_telegram_message", fake_send)
+
+    await tg.handle_threshold(FakeUpdate("0.8"), FakeContext())
+    assert sent == [r"Error occurred while fetching deals: upstream request failed"]
+
+
+@pytest.mark.asyncio
+async def test_send_telegram_message_honours_retry_after(monkeypatch):
+    statuses = iter([429, 200])
+    posts = []
+
+    async def fake_post(url, content=None, headers=None):
+        posts.append(content)
+        status = next(statuses)
+        body = {"ok": False, "parameters": {"retry_after": 0}} if status == 429 else {"ok": True}
+        return httpx.Response(status, json=body, request=httpx.Request("POST", url))
+
+    client = MagicMock(spec=httpx.AsyncClient)
+    client.post = AsyncMock(side_effect=fake_post)
+    monkeypatch.setattr(tg, "_client", client)
+
+    await tg.send_telegram_message("T", "C", "hello")
+    assert len(posts) == 2
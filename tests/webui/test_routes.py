@@ -13,6 +13,31 @@ async def test_get_index_ok():
         assert "Threshold" in text or "threshold" in text or "Deals" in text  # loose check for template presence
 
 
+@pytest.mark.asyncio
+async def test_get_index_etag_not_modified():
+    app = create_app()
+    async with app.test_app() as test_app:
+        client = test_app.test_client()
+        first = await client.get("/")
+        etag = first.headers["ETag"]
+        assert etag
+
+        second = await client.get("/", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_head_index_mirrors_get():
+    app = create_app()
+    async with app.test_app() as test_app:
+        client = test_app.test_client()
+        get = await client.get("/")
+        head = await client.head("/")
+        assert head.status_code == 200
+        assert head.headers["ETag"] == get.headers["ETag"]
+        assert head.headers["Content-Length"] == get.headers["Content-Length"]
+
+
 @pytest.mark.asyncio
 async def test_post_index_valid(monkeypatch):
     async def fake_get_cheap_items(source, keyword, max_pages, threshold_ratio):
@@ -36,3 +61,73 @@ async def test_post_index_valid(monkeypatch):
         assert resp.status_code == 200
         html = await resp.get_data(as_text=True)
         assert "Item A" in html and "Item B" in html
+
+
+@pytest.mark.asyncio
+async def test_app_closes_shared_resources_on_shutdown(monkeypatch):
+    import cosmicreseller.webui as webui_mod
+
+    closed = []
+
+    async def fake_close_clients():
+        closed.append("http")
+
+    async def fake_close_browser():
+        closed.append("browser")
+
+    monkeypatch.setattr(webui_mod, "close_clients", fake_close_clients)
+    monkeypatch.setattr(webui_mod, "close_browser", fake_close_browser)
+
+    app = create_app()
+    async with app.test_app():
+        assert closed == []
+    assert closed == ["http", "browser"]
+
+
+@pytest.mark.asyncio
+async def test_post_index_invalid_source_shows_error():
+    app = create_app()
+    async with app.test_app() as test_app:
+        client = test_app.test_client()
+        resp = await client.post(
+            "/",
+            form={"source": "amazon", "keyword": "ps4", "max_items": "1", "threshold_ratio": "0.8"},
+        )
+        assert resp.status_code == 200
+        html = await resp.get_data(as_text=True)
+        assert "Source must be &#39;facebook&#39; or &#39;ebay&#39;." in html
+
+
+@pytest.mark.asyncio
+async def test_post_index_normalizes_source_and_keyword(monkeypatch):
+    calls = []
+
+    async def fake_get_cheap_items(source, keyword, max_pages, threshold_ratio):
+        calls.append((source, keyword))
+        return (None, [])
+
+    import cosmicreseller.webui.routes as routes_mod
+    monkeypatch.setattr(routes_mod, "get_cheap_items", fake_get_cheap_items)
+
+    app = create_app()
+    async with app.test_app() as test_app:
+        client = test_app.test_client()
+        resp = await client.post(
+            "/",
+            form={"source": " EBay ", "keyword": " ps4 ", "max_items": "1", "threshold_ratio": "0.8"},
+        )
+        assert resp.status_code == 200
+    assert calls == [("ebay", "ps4")]
+
+
+@pytest.mark.asyncio
+async def test_template_bytecode_cache_is_opt_in(tmp_path):
+    app = create_app()
+    async with app.test_app():
+        assert app.jinja_env.bytecode_cache is None
+
+    cache_dir = tmp_path / "templates"
+    app = create_app()
+    app.config["TEMPLATE_CACHE_DIR"] = str(cache_dir)
+    async with app.test_app():
+        assert any(cache_dir.iterdir())